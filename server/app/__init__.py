@@ -1,5 +1,7 @@
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
+from redis import Redis
+from rq import Queue
 
 db = SQLAlchemy()
 
@@ -11,6 +13,12 @@ def create_app():
     # initialize the database
     db.init_app(app)
 
+    # queue for graph rendering jobs, consumed by
+    # `rq worker graphs --worker-class rq.SimpleWorker` (see app/workers/tasks.py)
+    app.extensions["graph_queue"] = Queue(
+        "graphs", connection=Redis.from_url(app.config["REDIS_URL"])
+    )
+
     from app.routes.main_routes import main
     from app.routes.api_routes import api
 
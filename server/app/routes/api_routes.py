@@ -1,15 +1,81 @@
-from flask import Blueprint, jsonify, request, send_file
+from flask import (
+    Blueprint,
+    current_app,
+    jsonify,
+    redirect,
+    request,
+    send_file,
+    url_for,
+)
+from app.services.graph_cache import get_cached_graph, make_cache_key, store_graph
 from app.workers.graph import (
-    create_graph_from_js_files,
     create_graph_from_github_repo,
-    visualize_graph,
+    create_graph_from_js_files,
+    get_repo_head,
+    graph_to_json,
+    hash_js_tree,
 )
+from app.workers.tasks import render_graph_job
+import json
 import os
-from io import BytesIO
-import tempfile
 
 api = Blueprint("api", __name__)
 
+# Formats the graph endpoint can produce, by ?format= value. "json" returns
+# the graph itself (see graph_to_json) for client-side rendering.
+GRAPH_MIMETYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "json": "application/json",
+}
+
+# Render jobs in these states will still produce their graph. Any other job
+# under the same id (failed, stopped, canceled, or a stale deferred/scheduled
+# one) is replaced by a fresh render, as is a finished one whose result has
+# expired.
+ACTIVE_JOB_STATUSES = ("queued", "started")
+
+
+def _send_cached_graph(cache_path, output_format):
+    """
+    Send a cached graph from disk. Serving the file by path lets werkzeug use
+    sendfile. The cache key names the inputs of a render, not its bytes:
+    layouts are unseeded, so a re-render after eviction can differ. The key
+    is therefore sent as a weak ETag, which still lets repeat GETs get a 304.
+    """
+    rv = send_file(
+        cache_path,
+        mimetype=GRAPH_MIMETYPES[output_format],
+        as_attachment=False,
+        download_name=f"dependency_graph.{output_format}",
+        etag=False,
+        last_modified=os.path.getmtime(cache_path),
+        max_age=3600,
+    )
+    rv.set_etag(os.path.basename(cache_path), weak=True)
+    return rv.make_conditional(request)
+
+
+def _enqueue_render_job(queue, job_id, **kwargs):
+    """
+    Enqueue render_graph_job under job_id unless an active job already has
+    it. The check and the enqueue run under a Redis lock so that concurrent
+    identical requests share one render instead of each enqueuing their own.
+    """
+    with queue.connection.lock(
+        f"graph-enqueue-lock:{job_id}", timeout=30, blocking_timeout=10
+    ):
+        job = queue.fetch_job(job_id)
+        if job is not None:
+            status = job.get_status()
+            if status in ACTIVE_JOB_STATUSES:
+                return job
+            # A finished job's image is still in Redis until its result
+            # expires, waiting to be fetched into this API's cache
+            if status == "finished" and job.return_value() is not None:
+                return job
+        return queue.enqueue(render_graph_job, job_id=job_id, **kwargs)
+
 
 @api.route("/status", methods=["GET"])
 def status():
@@ -22,39 +88,126 @@ def graph():
     path = data.get("path")
     repo_url = data.get("repo_url")
 
+    output_format = request.args.get("format", "png")
+
     if not path and not repo_url:
         return jsonify({"error": "No path or repo_url provided"}), 400
+    if output_format not in GRAPH_MIMETYPES:
+        return jsonify({"error": f"Unsupported format: {output_format}"}), 400
 
     try:
-        # Create temporary file for the graph image
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp_file:
-            temp_path = tmp_file.name
+        # Key the output by its inputs so unchanged sources skip the
+        # clone, parse, layout and render entirely
+        head = None
+        if path:
+            if not os.path.isdir(path):
+                return jsonify({"error": "Invalid or inaccessible path"}), 400
+            fingerprint = hash_js_tree(path)
+            cache_key = make_cache_key("path", os.path.abspath(path), fingerprint)
+        else:
+            head = get_repo_head(repo_url)
+            cache_key = make_cache_key("repo", repo_url, head)
+
+        cache_dir = current_app.config["GRAPH_CACHE_DIR"]
+        cache_name = f"{cache_key}.{output_format}"
+        job_id = f"{cache_key}-{output_format}"
 
-            # Generate the graph
+        # Conditional requests only apply to GET, so cached graphs are served
+        # from the GET endpoint, where ETag and max_age can take effect
+        result_url = url_for("api.graph_result", job_id=job_id)
+        if get_cached_graph(cache_dir, cache_name):
+            return redirect(result_url, 303)
+
+        # JSON skips layout and rendering entirely, so it is cheap enough to
+        # build inline; clients lay the graph out themselves
+        if output_format == "json":
             if path:
-                if not os.path.exists(path):
-                    return jsonify({"error": "Invalid or inaccessible path"}), 400
                 G = create_graph_from_js_files(path)
-            elif repo_url:
-                G = create_graph_from_github_repo(repo_url)
+            else:
+                G = create_graph_from_github_repo(repo_url, head)
+
+            store_graph(
+                cache_dir,
+                cache_name,
+                json.dumps(graph_to_json(G)).encode("utf-8"),
+                max_entries=current_app.config["GRAPH_CACHE_MAX_ENTRIES"],
+            )
+            return redirect(result_url, 303)
 
-            # Generate visualization using the existing function
-            visualize_graph(G, output_path=temp_path)
+        # Render in the background. Jobs are named after their cache entry,
+        # so identical requests share one job while it is queued or running
+        queue = current_app.extensions["graph_queue"]
+        job = _enqueue_render_job(
+            queue,
+            job_id,
+            kwargs={
+                "image_format": output_format,
+                "path": os.path.abspath(path) if path else None,
+                "repo_url": repo_url,
+                "ref": head,
+            },
+            job_timeout=current_app.config["GRAPH_JOB_TIMEOUT"],
+        )
 
-            # Read the generated image
-            with open(temp_path, "rb") as img_file:
-                output = BytesIO(img_file.read())
-                output.seek(0)
+        return (
+            jsonify({"job_id": job.id, "status": job.get_status()}),
+            202,
+            {"Location": result_url},
+        )
+
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
 
-            # Clean up the temporary file
-            os.unlink(temp_path)
 
-            return send_file(
-                output,
-                mimetype="image/png",
-                as_attachment=False,
-                download_name="dependency_graph.png",
+@api.route("/graph/<job_id>", methods=["GET"])
+def graph_result(job_id):
+    # Job ids are "<cache key>-<format>", so a rendered graph is served from
+    # the cache even after RQ has expired the finished job
+    cache_key, _, output_format = job_id.rpartition("-")
+    if output_format not in GRAPH_MIMETYPES or not cache_key.isalnum():
+        return jsonify({"error": "Unknown job"}), 404
+
+    try:
+        cache_dir = current_app.config["GRAPH_CACHE_DIR"]
+        cache_name = f"{cache_key}.{output_format}"
+        cache_path = get_cached_graph(cache_dir, cache_name)
+        if cache_path:
+            return _send_cached_graph(cache_path, output_format)
+
+        job = current_app.extensions["graph_queue"].fetch_job(job_id)
+        if job is None:
+            return jsonify({"error": "Unknown job"}), 404
+
+        status = job.get_status()
+        if status == "failed":
+            result = job.latest_result()
+            error = result.exc_string.strip().splitlines()[-1] if result else status
+            return jsonify({"error": error}), 500
+        if status == "finished":
+            # The worker returns the image bytes; copy them into this API's
+            # cache the first time they are fetched
+            data = job.return_value()
+            if data is None:
+                error = "Render result has expired, request the graph again"
+                return jsonify({"error": error}), 410
+            cache_path = store_graph(
+                cache_dir,
+                cache_name,
+                data,
+                max_entries=current_app.config["GRAPH_CACHE_MAX_ENTRIES"],
+            )
+            return _send_cached_graph(cache_path, output_format)
+        if status not in ACTIVE_JOB_STATUSES:
+            return (
+                jsonify(
+                    {
+                        "error": "Render did not complete, request the graph again",
+                        "status": status,
+                    }
+                ),
+                500,
             )
+        return jsonify({"job_id": job.id, "status": status}), 202
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
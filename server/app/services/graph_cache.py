@@ -0,0 +1,61 @@
+"""Disk cache for rendered dependency graphs, keyed by their inputs."""
+
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+
+
+def make_cache_key(*parts):
+    """Build a content-addressed cache key from the inputs of a render."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update(str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_cached_graph(cache_dir, name):
+    """Return the path of a cached graph, or None on a miss."""
+    cache_path = Path(cache_dir) / name
+    try:
+        # Bump only the access time so eviction treats this entry as recently
+        # used; the mtime stays put and keeps serving as Last-Modified
+        os.utime(cache_path, (time.time(), cache_path.stat().st_mtime))
+    except FileNotFoundError:
+        return None
+    return cache_path
+
+
+def store_graph(cache_dir, name, data, max_entries=256):
+    """Atomically write a rendered graph into the cache and evict old entries."""
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    # Write to a temporary file first so readers never see a partial image
+    fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temp_path, cache_dir / name)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+    _evict_least_recently_used(cache_dir, max_entries)
+    return cache_dir / name
+
+
+def _evict_least_recently_used(cache_dir, max_entries):
+    entries = []
+    for entry in os.scandir(cache_dir):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            entries.append((entry.stat().st_atime, entry.path))
+
+    entries.sort()
+    for _, path in entries[: max(len(entries) - max_entries, 0)]:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
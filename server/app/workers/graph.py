@@ -1,75 +1,257 @@
 import networkx as nx
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import mmap
+import multiprocessing
 import os
 import re
-from git import Repo
-import shutil
-import tempfile
+import hashlib
+import requests
+import tarfile
+import threading
 from urllib.parse import urlparse
-import matplotlib.pyplot as plt
+import matplotlib
+
+# Headless server rendering: never probe for a GUI backend
+matplotlib.use("Agg")
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+import numpy as np
 from pathlib import Path
+from scipy import sparse
+from scipy.optimize import minimize
+
+try:
+    # google-re2 is a drop-in for ``re`` backed by a linear-time DFA matcher.
+    import re2 as _re_engine
+except ImportError:
+    _re_engine = re
+
+# Optional compiled layout engines, used in place of networkx's pure-Python
+# spring layout when installed
+try:
+    import igraph
+except ImportError:
+    igraph = None
+
+try:
+    import graph_tool
+    import graph_tool.draw
+except ImportError:
+    graph_tool = None
+
+try:
+    import rustworkx
+except ImportError:
+    rustworkx = None
+
+
+# Single alternation for the supported import forms, so each file is scanned
+# once. The bare ``import 'x'`` branch comes first: it is the most specific
+# and would otherwise be swallowed by a lazy ``import ... from`` on the same
+# line. The pattern is bytes so files can be scanned without decoding them.
+_IMPORT_RE = _re_engine.compile(
+    rb'import\s+["\'](?P<side_effect>[^"\']+)["\']'  # import 'x'
+    rb'|import\s+.*?from\s+["\'](?P<from_import>[^"\']+)["\']'  # import x from 'y'
+    rb'|require\(["\'](?P<require>[^"\']+)["\']\)'  # require('x')
+)
 
 
 def parse_dependencies(content):
-    """Parse both import and require statements more accurately."""
-    dependencies = []
-
-    # Regular expressions for different import patterns
-    import_patterns = [
-        r'import\s+.*?from\s+["\']([^"\']+)["\']',  # import x from 'y'
-        r'require\(["\']([^"\']+)["\']\)',  # require('x')
-        r'import\s+["\']([^"\']+)["\']',  # import 'x'
+    """Parse both import and require statements from a bytes-like buffer."""
+    return [
+        match.group(match.lastgroup).decode("utf-8", "replace")
+        for match in _IMPORT_RE.finditer(content)
     ]
 
-    for pattern in import_patterns:
-        matches = re.finditer(pattern, content)
-        dependencies.extend(match.group(1) for match in matches)
 
-    return dependencies
+# Dependency, VCS and build-output directories: they never hold project
+# sources and can contain tens of thousands of .js files
+_SKIP_DIRS = frozenset({"node_modules", ".git", "dist", "build", ".next", "coverage"})
+
+
+def _iter_js_files(root):
+    """Yield a DirEntry for every .js file under root, skipping _SKIP_DIRS."""
+    root = os.fspath(root)
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            # Like rglob, skip subdirectories that can't be listed
+            if directory == root:
+                raise
+            continue
+
+        with entries:
+            for entry in entries:
+                # The entry type comes from the directory listing, no stat
+                # needed. As with rglob, symlinked files are included but
+                # symlinked directories are not descended into.
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in _SKIP_DIRS:
+                        pending.append(entry.path)
+                elif entry.name.endswith(".js") and entry.is_file():
+                    yield entry
+
+
+def get_file_info(entry):
+    """Get file attributes for node metadata from a DirEntry."""
+    stats = entry.stat()
+    return {"size": stats.st_size, "last_modified": stats.st_mtime}
+
+
+# Files handed to each pool worker per round trip. Directories with fewer
+# files than this are parsed in-process, where the pool start-up would cost
+# more than it saves.
+_PARSE_CHUNKSIZE = 32
+
+# One parse pool shared by every scan, capped so concurrent requests queue on
+# the same workers instead of each starting a full set of processes.
+_PARSE_MAX_WORKERS = min(os.cpu_count() or 1, 8)
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+
+def _get_parse_pool():
+    """Return the shared parse pool, starting it on first use."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # Scans run on request threads, and forking a multi-threaded
+            # process can deadlock, so workers come from a forkserver
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=_PARSE_MAX_WORKERS,
+                mp_context=multiprocessing.get_context("forkserver"),
+            )
+        return _parse_pool
+
+
+def _discard_parse_pool(pool):
+    """Forget a broken pool so the next scan starts a fresh one."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is pool:
+            _parse_pool = None
+    pool.shutdown(wait=False)
+
+
+def _parse_one(task):
+    """Read and parse a (file path, relative path, file info) task."""
+    file_path, relative_path, file_info = task
 
+    try:
+        with open(file_path, "rb") as f:
+            # Map anything past a page instead of copying it into memory;
+            # smaller files are cheaper to read outright.
+            if file_info["size"] < mmap.PAGESIZE:
+                dependencies = parse_dependencies(f.read())
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                    dependencies = parse_dependencies(content)
+    except (IOError, ValueError) as e:
+        raise IOError(f"Error reading file {file_path}: {e}") from e
 
-def get_file_info(file_path):
-    """Get file attributes for node metadata."""
-    stats = os.stat(file_path)
-    return {
-        "size": stats.st_size,
-        "path": str(file_path),
-        "last_modified": stats.st_mtime,
+    return relative_path, file_info, dependencies
+
+
+def _add_parsed_files(G, results):
+    """
+    Add (relative path, file info, dependencies) tuples to the graph.
+    File metadata is kept column-wise in G.graph["metadata"] rather than as
+    per-node attribute dicts: "names" lists the file nodes, and the NumPy
+    arrays "sizes" and "mtimes" hold their values at the same index.
+    """
+    names, sizes, mtimes = [], [], []
+    for relative_path, file_info, dependencies in results:
+        G.add_node(relative_path)
+        names.append(relative_path)
+        sizes.append(file_info["size"])
+        mtimes.append(file_info["last_modified"])
+
+        for dep in dependencies:
+            # Handle different dependency types
+            if dep.endswith(".js"):
+                # Local dependency
+                G.add_edge(relative_path, dep, type="local")
+            else:
+                # External dependency
+                G.add_edge(relative_path, dep, type="external")
+
+    G.graph["metadata"] = {
+        "names": names,
+        "sizes": np.fromiter(sizes, dtype=np.int64, count=len(sizes)),
+        "mtimes": np.fromiter(mtimes, dtype=np.float64, count=len(mtimes)),
     }
 
 
 def create_graph_from_js_files(path):
+    """
+    Build the dependency graph of the .js files under path. Raises if any
+    file can't be read or parsed: a partial graph would otherwise be cached
+    as if it were complete.
+    """
     G = nx.DiGraph()
     path = Path(path)
 
-    try:
-        for file_path in path.rglob("*.js"):
-            relative_path = file_path.relative_to(path)
-            file_info = get_file_info(file_path)
-
-            # Add node with attributes
-            G.add_node(str(relative_path), **file_info)
-
-            try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                    dependencies = parse_dependencies(content)
+    # DirEntry objects can't be pickled, so stat them here and send the
+    # workers plain (path, relative path, info) tasks
+    tasks = [
+        (entry.path, os.path.relpath(entry.path, path), get_file_info(entry))
+        for entry in _iter_js_files(path)
+    ]
 
-                    for dep in dependencies:
-                        # Handle different dependency types
-                        if dep.endswith(".js"):
-                            # Local dependency
-                            G.add_edge(str(relative_path), dep, type="local")
-                        else:
-                            # External dependency
-                            G.add_edge(str(relative_path), dep, type="external")
+    # Parsing is CPU-bound and holds the GIL, so fan it out to processes
+    # and only mutate the graph back here.
+    if len(tasks) < _PARSE_CHUNKSIZE:
+        results = [_parse_one(task) for task in tasks]
+    else:
+        pool = _get_parse_pool()
+        try:
+            results = list(pool.map(_parse_one, tasks, chunksize=_PARSE_CHUNKSIZE))
+        except BrokenProcessPool:
+            _discard_parse_pool(pool)
+            raise
+
+    _add_parsed_files(G, results)
+    return G
 
-            except (IOError, UnicodeDecodeError) as e:
-                print(f"Error reading file {file_path}: {e}")
 
-    except Exception as e:
-        print(f"Error processing directory {path}: {e}")
+def graph_to_json(G):
+    """
+    Serialise the graph as JSON-ready node-link data, with no layout:
+
+        {
+            "directed": true,
+            "multigraph": false,
+            "graph": {"metadata": {"names": [...], "sizes": [...], "mtimes": [...]}},
+            "nodes": [{"id": "src/app.js"}, {"id": "react"}, ...],
+            "edges": [
+                {"source": "src/app.js", "target": "react", "type": "external"},
+                ...
+            ]
+        }
+
+    Nodes ending in ".js" are project files, the rest are external packages;
+    "metadata" holds each file's size and mtime at the index of its name.
+    """
+    data = nx.node_link_data(G, edges="edges")
 
-    return G
+    metadata = G.graph.get("metadata")
+    if metadata is not None:
+        data["graph"] = {
+            **G.graph,
+            "metadata": {
+                "names": metadata["names"],
+                "sizes": metadata["sizes"].tolist(),
+                "mtimes": metadata["mtimes"].tolist(),
+            },
+        }
+    return data
 
 
 def validate_github_url(url):
@@ -84,48 +266,307 @@ def validate_github_url(url):
         return False
 
 
-def create_graph_from_github_repo(repo_url):
+def hash_js_tree(path):
+    """Fingerprint the .js files under a directory by path, mtime and size."""
+    digest = hashlib.blake2b(digest_size=16)
+
+    for entry in sorted(_iter_js_files(path), key=lambda entry: entry.path):
+        stats = entry.stat()
+        relative_path = os.path.relpath(entry.path, path)
+        digest.update(
+            f"{relative_path}\0{stats.st_mtime_ns}\0{stats.st_size}\n".encode()
+        )
+
+    return digest.hexdigest()
+
+
+def _github_repo_name(repo_url):
+    """Return (owner, repo) for a GitHub repository URL."""
     if not validate_github_url(repo_url):
         raise ValueError("Invalid GitHub repository URL")
 
-    temp_dir = tempfile.mkdtemp()
+    owner, repo = urlparse(repo_url).path.strip("/").split("/")
+    return owner, repo.removesuffix(".git")
+
+
+def get_repo_head(repo_url):
+    """
+    Resolve the commit sha of a GitHub repository's HEAD without cloning it.
+    Reads the ref advertisement of git's smart HTTP protocol directly, which
+    is what `git ls-remote` does, without starting a git process.
+    """
+    owner, repo = _github_repo_name(repo_url)
+    response = requests.get(
+        f"https://github.com/{owner}/{repo}.git/info/refs",
+        params={"service": "git-upload-pack"},
+        timeout=30,
+    )
+    response.raise_for_status()
+
+    # The body is a sequence of pkt-lines: a 4-digit hex length (including
+    # itself) followed by the payload, with "0000" as a flush packet. Ref
+    # lines read "<sha> <ref>", the first one followed by NUL and capabilities.
+    data = response.content
+    pos = 0
+    while pos + 4 <= len(data):
+        length = int(data[pos : pos + 4], 16)
+        if length == 0:
+            pos += 4
+            continue
+        payload = data[pos + 4 : pos + length].split(b"\0")[0].rstrip(b"\n")
+        pos += length
+
+        sha, _, ref = payload.partition(b" ")
+        if ref == b"HEAD":
+            return sha.decode("ascii")
+
+    raise ValueError("Repository has no HEAD commit")
+
+
+def _parse_tar_members(tar):
+    """Parse the .js files of a streamed repository archive."""
+    for member in tar:
+        if not member.isfile() or not member.name.endswith(".js"):
+            continue
+
+        # Archive entries live under a single "<repo>-<sha>/" directory
+        relative_path = member.name.partition("/")[2]
+        if _SKIP_DIRS.intersection(relative_path.split("/")[:-1]):
+            continue
+        file_info = {"size": member.size, "last_modified": member.mtime}
+        dependencies = parse_dependencies(tar.extractfile(member).read())
+        yield relative_path, file_info, dependencies
+
+
+def create_graph_from_github_repo(repo_url, ref="HEAD"):
+    """
+    Build the dependency graph of a GitHub repository at ref. Pass the sha
+    that the graph is cached under so the download matches it even if the
+    branch moves in between.
+    """
+    owner, repo = _github_repo_name(repo_url)
+    archive_url = f"https://codeload.github.com/{owner}/{repo}/tar.gz/{ref}"
+
+    G = nx.DiGraph()
     try:
-        Repo.clone_from(repo_url, temp_dir)
-        G = create_graph_from_js_files(temp_dir)
-        print(temp_dir)
-        # visualize_graph(G)
-        return G
+        # Stream the tree as a tarball and parse it in memory, so nothing is
+        # cloned or written to disk
+        with requests.get(archive_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            with tarfile.open(fileobj=response.raw, mode="r|gz") as tar:
+                _add_parsed_files(G, _parse_tar_members(tar))
     except Exception as e:
-        raise Exception(f"Error cloning repository: {e}")
-    finally:
-        shutil.rmtree(temp_dir)
+        raise Exception(f"Error downloading repository: {e}")
+
+    return G
+
+
+# Graphs larger than this are laid out with graph-tool's Barnes-Hut SFDP,
+# which is O(n log n) and runs on all cores.
+_SFDP_MIN_NODES = 5000
+
+# Without a compiled engine, graphs larger than this are laid out by
+# minimising the Fruchterman-Reingold energy with L-BFGS, which converges in
+# far fewer iterations than networkx's force-stepping loop. 15 iterations
+# already reach a lower FR energy than spring_layout's 50 steps.
+_LBFGS_MIN_NODES = 500
+_LBFGS_ITERATIONS = 15
+
+# Rows of the pairwise repulsion computed at once, bounding its memory use.
+_REPULSION_BLOCK = 512
 
 
-def visualize_graph(G, output_path="dependency_graph.png"):
+def _lbfgs_fruchterman_reingold(G, k=None, iterations=50, gravity=1.0, seed=None):
+    """
+    Fruchterman-Reingold layout found by minimising its energy with L-BFGS.
+    The FR forces are the gradient of sum(d**3 / 3k) over edges minus
+    sum(k**2 * log(d)) over node pairs; a weak pull toward the centroid keeps
+    disconnected components together.
+    """
+    nodes = list(G)
+    n = len(nodes)
+    if n == 0:
+        return {}
+    k = 1 / np.sqrt(n) if k is None else k
+    softening = (0.01 * k) ** 2
+
+    # Edge incidence matrix, so edge deltas and their forces are sparse mat-vecs
+    adjacency = nx.to_scipy_sparse_array(
+        G.to_undirected(as_view=True), nodelist=nodes, weight=None, format="coo"
+    )
+    mask = adjacency.row < adjacency.col
+    rows, cols = adjacency.row[mask], adjacency.col[mask]
+    incidence = sparse.csr_array(
+        (
+            np.concatenate([np.ones(len(rows)), -np.ones(len(cols))]),
+            (np.tile(np.arange(len(rows)), 2), np.concatenate([rows, cols])),
+        ),
+        shape=(len(rows), n),
+    )
+
+    def energy_and_gradient(flat):
+        pos = flat.reshape(n, 2)
+        grad = np.zeros_like(pos)
+
+        # Attraction along edges
+        deltas = incidence @ pos
+        lengths = np.sqrt((deltas**2).sum(axis=1) + softening)
+        energy = (lengths**3).sum() / (3 * k)
+        grad += incidence.T @ (deltas * (lengths / k)[:, None])
+
+        # Repulsion between every pair, one block of rows at a time. With
+        # w = 1 / d**2 the gradient on row i is k**2 * (sum_j w_ij * x_j -
+        # x_i * sum_j w_ij), so each block reduces to one matrix product.
+        sq_norms = (pos**2).sum(axis=1)
+        for start in range(0, n, _REPULSION_BLOCK):
+            block = pos[start : start + _REPULSION_BLOCK]
+            dist2 = sq_norms[start : start + _REPULSION_BLOCK, None] + sq_norms
+            dist2 -= 2 * (block @ pos.T)
+            np.maximum(dist2, 0, out=dist2)
+            dist2 += softening
+            energy -= 0.25 * k * k * np.log(dist2).sum()
+            weights = np.reciprocal(dist2, out=dist2)
+            grad[start : start + _REPULSION_BLOCK] += (
+                k * k * (weights @ pos - block * weights.sum(axis=1)[:, None])
+            )
+
+        # Gravity toward the centroid
+        centred = pos - pos.mean(axis=0)
+        energy += 0.5 * gravity * (centred**2).sum()
+        grad += gravity * centred
+
+        return energy, grad.ravel()
+
+    rng = np.random.default_rng(seed)
+    x0 = rng.random((n, 2)) * k * np.sqrt(n)
+    result = minimize(
+        energy_and_gradient,
+        x0.ravel(),
+        jac=True,
+        method="L-BFGS-B",
+        options={"maxiter": iterations},
+    )
+
+    pos = nx.rescale_layout(result.x.reshape(n, 2))
+    return dict(zip(nodes, pos))
+
+
+# Layouts of recently drawn graphs, keyed by a hash of their structure, so
+# restyled renders of the same graph skip the layout step.
+_LAYOUT_CACHE_SIZE = 32
+_layout_cache = OrderedDict()
+_layout_cache_lock = threading.Lock()
+
+
+def _compute_layout(G):
+    """Return node positions for G, reusing the layout of an identical graph."""
+    key = hashlib.blake2b(
+        repr((sorted(G.nodes()), sorted(G.edges()))).encode("utf-8"),
+        digest_size=16,
+    ).hexdigest()
+
+    with _layout_cache_lock:
+        if key in _layout_cache:
+            _layout_cache.move_to_end(key)
+            return _layout_cache[key]
+
+    pos = _run_layout(G)
+
+    with _layout_cache_lock:
+        _layout_cache[key] = pos
+        if len(_layout_cache) > _LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return pos
+
+
+def _run_layout(G):
+    """Compute node positions, using a compiled layout engine when available."""
+    nodes = list(G)
+    use_sfdp = graph_tool is not None and len(nodes) > _SFDP_MIN_NODES
+    if not use_sfdp and igraph is None and rustworkx is None:
+        if len(nodes) > _LBFGS_MIN_NODES:
+            return _lbfgs_fruchterman_reingold(G, k=2, iterations=_LBFGS_ITERATIONS)
+        return nx.spring_layout(G, k=2, iterations=50)
+
+    index = {node: i for i, node in enumerate(nodes)}
+    edges = [(index[u], index[v]) for u, v in G.edges()]
+
+    if use_sfdp:
+        gt_graph = graph_tool.Graph(directed=False)
+        gt_graph.add_vertex(len(nodes))
+        gt_graph.add_edge_list(edges)
+        coords = graph_tool.draw.sfdp_layout(gt_graph).get_2d_array([0, 1]).T
+    elif igraph is not None:
+        ig_graph = igraph.Graph(n=len(nodes), edges=edges, directed=True)
+        coords = ig_graph.layout_fruchterman_reingold(
+            niter=100, grid="nogrid" if len(nodes) < 1000 else "grid"
+        ).coords
+    else:
+        rx_graph = rustworkx.PyDiGraph()
+        rx_graph.add_nodes_from(nodes)
+        rx_graph.extend_from_edge_list(edges)
+        layout = rustworkx.spring_layout(rx_graph, num_iter=50)
+        coords = [layout[i] for i in range(len(nodes))]
+
+    return {node: tuple(xy) for node, xy in zip(nodes, coords)}
+
+
+def visualize_graph(G, output="dependency_graph.png", format="png", dpi=100):
     """
     Create a more organized and readable visualization of the dependency graph.
-    Uses spring_layout instead of kamada_kawai_layout to avoid scipy dependency.
+    Uses a force-directed layout (igraph, graph-tool or rustworkx when installed,
+    otherwise spring_layout, or an L-BFGS energy minimisation on large graphs)
+    instead of kamada_kawai_layout.
+    `output` is either a file path or a writable binary file object; `format` is
+    "png" or "svg". 100 DPI is plenty for a browser, and SVG stays sharp at
+    any zoom without rasterising at all.
     """
-    plt.figure(figsize=(16, 12))  # Larger figure size for better readability
+    # Draw on a standalone Agg figure rather than through pyplot, so renders
+    # share no global state and can run in parallel threads
+    fig = Figure(figsize=(16, 12))  # Larger figure size for better readability
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
 
-    # Use spring layout with optimized parameters for better organization
-    pos = nx.spring_layout(G, k=2, iterations=50)
+    # Use a force-directed layout for better organization
+    pos = _compute_layout(G)
 
     # Set base node size
     base_node_size = 2000
 
-    # Draw nodes with different colors based on type
-    external_deps = [node for node in G.nodes() if not node.endswith(".js")]
-    internal_deps = [node for node in G.nodes() if node.endswith(".js")]
+    # Split nodes by type and build their labels in a single pass; labels
+    # keep only the last two path components
+    internal_deps, external_deps, labels = [], [], {}
+    for node in G.nodes():
+        (internal_deps if node.endswith(".js") else external_deps).append(node)
+        labels[node] = "\n".join(node.rsplit("/", 2)[-2:]) if "/" in node else node
+
+    # Draw parsed files straight from the metadata columns, sized by their
+    # source size relative to the median file. node_size is a marker area,
+    # so area grows with bytes, clipped to a quarter to four times the base.
+    metadata = G.graph.get("metadata")
+    parsed_files = metadata["names"] if metadata is not None else []
+    if parsed_files:
+        sizes = metadata["sizes"]
+        scale = np.clip(sizes / max(np.median(sizes), 1), 0.25, 4.0)
+        nx.draw_networkx_nodes(
+            G,
+            pos,
+            nodelist=parsed_files,
+            node_color="lightblue",
+            node_size=scale * base_node_size,
+            alpha=0.7,
+            ax=ax,
+        )
 
-    # Draw internal files (*.js files)
+    # Draw imported .js files that weren't parsed themselves at the base size
     nx.draw_networkx_nodes(
         G,
         pos,
-        nodelist=internal_deps,
+        nodelist=list(set(internal_deps).difference(parsed_files)),
         node_color="lightblue",
         node_size=base_node_size,
         alpha=0.7,
+        ax=ax,
     )
 
     # Draw external dependencies (npm packages, etc.)
@@ -136,13 +577,16 @@ def visualize_graph(G, output_path="dependency_graph.png"):
         node_color="lightgreen",
         node_size=base_node_size,
         alpha=0.7,
+        ax=ax,
     )
 
-    # Draw edges with different styles based on type
-    edges_local = [(u, v) for (u, v) in G.edges() if G[u][v].get("type") == "local"]
-    edges_external = [
-        (u, v) for (u, v) in G.edges() if G[u][v].get("type") == "external"
-    ]
+    # Draw edges with different styles based on type, split in a single pass
+    edges_local, edges_external = [], []
+    for u, v, edge_type in G.edges(data="type"):
+        if edge_type == "local":
+            edges_local.append((u, v))
+        elif edge_type == "external":
+            edges_external.append((u, v))
 
     # Draw local dependencies
     nx.draw_networkx_edges(
@@ -153,6 +597,7 @@ def visualize_graph(G, output_path="dependency_graph.png"):
         alpha=0.4,
         arrows=True,
         arrowsize=20,
+        ax=ax,
     )
 
     # Draw external dependencies
@@ -164,24 +609,22 @@ def visualize_graph(G, output_path="dependency_graph.png"):
         alpha=0.4,
         arrows=True,
         arrowsize=20,
+        ax=ax,
     )
 
     # Add labels with better formatting
-    labels = {
-        node: "\n".join(node.split("/")[-2:]) if "/" in node else node
-        for node in G.nodes()
-    }
-
-    nx.draw_networkx_labels(G, pos, labels=labels, font_size=8, font_weight="bold")
+    nx.draw_networkx_labels(
+        G, pos, labels=labels, font_size=8, font_weight="bold", ax=ax
+    )
 
     # Add a title and legend
-    plt.title("JavaScript Dependencies Graph", pad=20, size=16)
+    ax.set_title("JavaScript Dependencies Graph", pad=20, size=16)
 
     # Add legend with fixed marker sizes
     legend_elements = [
-        plt.Line2D([0], [0], color="blue", alpha=0.4, label="Local Dependencies"),
-        plt.Line2D([0], [0], color="red", alpha=0.4, label="External Dependencies"),
-        plt.Line2D(
+        Line2D([0], [0], color="blue", alpha=0.4, label="Local Dependencies"),
+        Line2D([0], [0], color="red", alpha=0.4, label="External Dependencies"),
+        Line2D(
             [0],
             [0],
             marker="o",
@@ -190,7 +633,7 @@ def visualize_graph(G, output_path="dependency_graph.png"):
             markersize=10,
             linestyle="None",
         ),
-        plt.Line2D(
+        Line2D(
             [0],
             [0],
             marker="o",
@@ -200,17 +643,16 @@ def visualize_graph(G, output_path="dependency_graph.png"):
             linestyle="None",
         ),
     ]
-    plt.legend(handles=legend_elements, loc="upper left", bbox_to_anchor=(1, 1))
+    ax.legend(handles=legend_elements, loc="upper left", bbox_to_anchor=(1, 1))
 
     # Add padding around the graph
-    plt.margins(0.2)
+    ax.margins(0.2)
 
     # Ensure the layout is tight but includes the legend
-    plt.tight_layout()
+    fig.tight_layout()
 
-    # Save with high DPI for better quality
-    plt.savefig(output_path, dpi=300, bbox_inches="tight", pad_inches=0.5)
-    plt.close()
+    fig.savefig(output, format=format, dpi=dpi, bbox_inches="tight", pad_inches=0.5)
 
-    print(f"Graph saved to {output_path}")
-    return output_path
+    if isinstance(output, (str, os.PathLike)):
+        print(f"Graph saved to {output}")
+    return output
@@ -0,0 +1,33 @@
+"""
+Background jobs run by the RQ worker. Start one from the server directory
+with `rq worker graphs --worker-class rq.SimpleWorker --url $REDIS_URL`; it
+needs the same filesystem view as the API for `path` requests.
+
+SimpleWorker is required: the default worker forks a child per job, which
+throws away the in-process layout cache and the parse pool after every
+render.
+"""
+
+from io import BytesIO
+
+from app.workers.graph import (
+    create_graph_from_github_repo,
+    create_graph_from_js_files,
+    visualize_graph,
+)
+
+
+def render_graph_job(image_format, path=None, repo_url=None, ref=None):
+    """
+    Build and render a dependency graph, returning the image bytes. They are
+    stored in Redis as the job result, and the API copies them into its own
+    cache on first fetch, so the worker shares no cache directory with it.
+    """
+    if path:
+        G = create_graph_from_js_files(path)
+    else:
+        G = create_graph_from_github_repo(repo_url, ref)
+
+    output = BytesIO()
+    visualize_graph(G, output=output, format=image_format)
+    return output.getvalue()
@@ -1,6 +1,7 @@
 #  all configuration settings for the application
 
 import os
+import tempfile
 
 
 class Config:
@@ -8,3 +9,12 @@ class Config:
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = os.getenv("DATABASE_URL", "sqlite:///db.sqlite")
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Local to each API process: render workers return image bytes through
+    # Redis and never touch it, so it needs no shared or persistent storage
+    GRAPH_CACHE_DIR = os.getenv(
+        "GRAPH_CACHE_DIR",
+        os.path.join(tempfile.gettempdir(), "projectvisualizer-graphs"),
+    )
+    GRAPH_CACHE_MAX_ENTRIES = int(os.getenv("GRAPH_CACHE_MAX_ENTRIES", "256"))
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    GRAPH_JOB_TIMEOUT = int(os.getenv("GRAPH_JOB_TIMEOUT", "600"))